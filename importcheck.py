@@ -1,5 +1,40 @@
 #!/usr/bin/env python3
 from pathlib import Path
+import mmap
+import os
+
+from patch_imports import iter_converter_files
+
+
+def iter_pyrit_import_lines(path, max_lines=50):
+    """Yield lines among the first max_lines of path that mention pyrit imports."""
+    with path.open('rb') as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = 0
+            for _ in range(max_lines):
+                end = mm.find(b'\n', end) + 1
+                if end == 0:
+                    end = len(mm)
+                    break
+            head = mm[:end]
+
+    line_starts = set()
+    for needle in (b'from pyrit', b'import pyrit'):
+        i = head.find(needle)
+        while i != -1:
+            start = head.rfind(b'\n', 0, i) + 1
+            line_starts.add(start)
+            eol = head.find(b'\n', i)
+            if eol == -1:
+                break
+            i = head.find(needle, eol + 1)
+
+    for start in sorted(line_starts):
+        eol = head.find(b'\n', start)
+        yield head[start:eol if eol != -1 else len(head)].decode()
+
 
 converter_dir = Path("prompt_converter")
 sample_file = converter_dir / "base64_converter.py"
@@ -18,14 +53,11 @@ print("Checking all converter files for import patterns...")
 print("="*80)
 
 import_patterns = {}
-for f in converter_dir.glob("*_converter.py"):
-    content = f.read_text()
-    lines = content.split('\n')
-    for line in lines[:50]:  # Check first 50 lines
-        if 'from pyrit' in line or 'import pyrit' in line:
-            if line not in import_patterns:
-                import_patterns[line] = []
-            import_patterns[line].append(f.name)
+for f in iter_converter_files(converter_dir):
+    for line in iter_pyrit_import_lines(f):  # Check first 50 lines
+        if line not in import_patterns:
+            import_patterns[line] = []
+        import_patterns[line].append(f.name)
 
 if import_patterns:
     print("\nFound these pyrit imports:")
@@ -4,7 +4,10 @@ Patch all converter files to use pyrit_compat instead of direct pyrit imports.
 Rewrites imports from pyrit.* to use pyrit_compat equivalents.
 """
 
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Mapping of pyrit imports to pyrit_compat replacements
@@ -52,27 +55,39 @@ IMPORT_MAPPINGS = {
         "pass  # REQUIRED_VALUE not available",
 }
 
-# Multi-line import patterns to handle
+# Converter files are patched as raw bytes; every rewritten token is ASCII,
+# so matching on the UTF-8 encoding is equivalent to matching the text
+_B_MAPPINGS = {old.encode(): new.encode() for old, new in IMPORT_MAPPINGS.items()}
+
+# (old, new) pairs, longest first so specific imports win over their prefixes
+_IMPORT_MAPPINGS_SORTED = sorted(_B_MAPPINGS.items(), key=lambda kv: -len(kv[0]))
+
+# Alternation of all IMPORT_MAPPINGS keys; longest-first order makes the
+# regex prefer the most specific import at each position, so the whole
+# exact-match pass is a single scan
+_EXACT_RE = re.compile(b'|'.join(re.escape(old) for old, _ in _IMPORT_MAPPINGS_SORTED))
+
+# Multi-line import patterns to handle (compiled once at module load)
 MULTILINE_PATTERNS = [
     # from pyrit.models import (...)
     (
-        r"from pyrit\.models import \(\s*([\s\S]*?)\)",
-        lambda m: handle_multiline_models_import(m.group(1))
+        re.compile(rb"from pyrit\.models import \(\s*([\s\S]*?)\)", re.MULTILINE),
+        lambda m: handle_multiline_models_import(m.group(1).decode()).encode()
     ),
     # from pyrit.prompt_converter.text_selection_strategy import (...)
     (
-        r"from pyrit\.prompt_converter\.text_selection_strategy import \(\s*([\s\S]*?)\)",
-        lambda m: "from pyrit_compat import WordSelectionStrategy"
+        re.compile(rb"from pyrit\.prompt_converter\.text_selection_strategy import \(\s*([\s\S]*?)\)", re.MULTILINE),
+        lambda m: b"from pyrit_compat import WordSelectionStrategy"
     ),
     # from pyrit.prompt_converter.word_level_converter import (...)
     (
-        r"from pyrit\.prompt_converter\.word_level_converter import \(\s*([\s\S]*?)\)",
-        lambda m: "from pyrit_compat import WordLevelConverter"
+        re.compile(rb"from pyrit\.prompt_converter\.word_level_converter import \(\s*([\s\S]*?)\)", re.MULTILINE),
+        lambda m: b"from pyrit_compat import WordLevelConverter"
     ),
     # from pyrit.exceptions import (...)
     (
-        r"from pyrit\.exceptions import \(\s*([\s\S]*?)\)",
-        lambda m: "pass  # pyrit.exceptions not shimmed"
+        re.compile(rb"from pyrit\.exceptions import \(\s*([\s\S]*?)\)", re.MULTILINE),
+        lambda m: b"pass  # pyrit.exceptions not shimmed"
     ),
 ]
 
@@ -94,49 +109,66 @@ def handle_multiline_models_import(imports_text):
         return "pass  # pyrit.models imports not available"
 
 
-def patch_file(file_path: Path) -> tuple[int, int]:
+def replace_exact_imports(content: bytes) -> tuple[bytes, int]:
+    """
+    Rewrite every IMPORT_MAPPINGS key found in content in one pass.
+    Returns (new_content, replacements_made)
+    """
+    return _EXACT_RE.subn(lambda m: _B_MAPPINGS[m.group(0)], content)
+
+
+def patch_file(file_path: Path) -> tuple[int, int, str | None]:
     """
     Patch a single converter file.
-    Returns (replacements_made, total_imports_processed)
+    Returns (replacements_made, total_imports_processed, report_line)
     """
     try:
-        content = file_path.read_text()
-        original_content = content
+        content = file_path.read_bytes()
+        if b'pyrit' not in content:
+            return 0, 0, None
         
         # First pass: handle exact matches
-        for old_import, new_import in IMPORT_MAPPINGS.items():
-            if old_import in content:
-                content = content.replace(old_import, new_import)
+        content, count = replace_exact_imports(content)
+        changed = count > 0
         
         # Second pass: handle multiline patterns
-        for pattern, replacement in MULTILINE_PATTERNS:
-            content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
+        if b'pyrit.' in content:
+            for pattern, replacement in MULTILINE_PATTERNS:
+                content, count = pattern.subn(replacement, content)
+                changed = changed or count > 0
         
         # Remove duplicate imports
-        lines = content.split('\n')
-        seen = set()
-        deduplicated_lines = []
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith('from pyrit_compat import') or not stripped.startswith('from pyrit'):
-                if stripped not in seen or not stripped.startswith('from pyrit_compat'):
-                    deduplicated_lines.append(line)
-                    if stripped.startswith('from pyrit_compat'):
-                        seen.add(stripped)
-            else:
+        if b'from pyrit_compat' in content:
+            seen = set()
+            deduplicated_lines = []
+            for line in content.split(b'\n'):
+                stripped = line.strip()
+                if stripped.startswith(b'from pyrit_compat import'):
+                    if stripped in seen:
+                        changed = True
+                        continue
+                    seen.add(stripped)
                 deduplicated_lines.append(line)
-        
-        content = '\n'.join(deduplicated_lines)
+            
+            if changed:
+                content = b'\n'.join(deduplicated_lines)
         
         # Write back if changed
-        if content != original_content:
-            file_path.write_text(content)
-            return 1, 1
-        return 0, 0
+        if changed:
+            file_path.write_bytes(content)
+            return 1, 1, f"✅ {file_path.name}"
+        return 0, 0, None
         
     except Exception as e:
-        print(f"Error patching {file_path}: {e}")
-        return 0, 1
+        return 0, 1, f"Error patching {file_path}: {e}"
+
+
+def iter_converter_files(converter_dir):
+    """Yield the *_converter.py files directly inside converter_dir."""
+    with os.scandir(converter_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('_converter.py') and entry.is_file():
+                yield Path(entry.path)
 
 
 def main():
@@ -147,20 +179,28 @@ def main():
         print(f"Error: {converter_dir} not found")
         return
     
-    converter_files = sorted(converter_dir.glob("*_converter.py"))
+    converter_files = sorted(iter_converter_files(converter_dir))
     print(f"Found {len(converter_files)} converter files to patch")
     print("=" * 70)
     
     patched = 0
     total = 0
     
-    for file_path in converter_files:
-        patched_count, total_count = patch_file(file_path)
-        if patched_count > 0:
-            print(f"✅ {file_path.name}")
-            patched += patched_count
+    # Files are independent, so patch them across worker processes
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(patch_file, converter_files, chunksize=4))
+    
+    report = []
+    for patched_count, total_count, message in results:
+        if message is not None:
+            report.append(message)
+        patched += patched_count
         total += total_count
     
+    # One write for the whole per-file report
+    if report:
+        sys.stdout.write('\n'.join(report) + '\n')
+    
     print("=" * 70)
     print(f"\nSummary:")
     print(f"  Patched files: {patched}")
@@ -4,8 +4,13 @@ Converter Patcher - Fixes import issues in converter files
 Replaces pyrit.identifiers imports with compatibility shim
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import json
 import re
+import sys
+
+from patch_imports import iter_converter_files
 
 print("="*80)
 print("CONVERTER FILE PATCHER")
@@ -18,40 +23,45 @@ if not converter_dir.exists():
     exit(1)
 
 # Find all converter files
-converter_files = list(converter_dir.glob("*_converter.py"))
+converter_files = list(iter_converter_files(converter_dir))
 print(f"\nFound {len(converter_files)} converter files")
 
-# Import replacements
+# Import replacements (compiled once up front)
 replacements = [
     # Replace pyrit.identifiers imports
     (
-        r'from pyrit\.identifiers import (\w+)',
+        re.compile(r'from pyrit\.identifiers import (\w+)'),
         r'from pyrit_compat import \1'
     ),
     # Replace pyrit.common.path imports
     (
-        r'from pyrit\.common\.path import (\w+)',
+        re.compile(r'from pyrit\.common\.path import (\w+)'),
         r'from pyrit_compat import \1'
     ),
     # Add pyrit_compat to existing imports if needed
     (
-        r'from pyrit\.models import SeedPrompt',
+        re.compile(r'from pyrit\.models import SeedPrompt'),
         'from pyrit_compat import SeedPrompt'
     ),
 ]
 
-patched_count = 0
-error_count = 0
 
-for converter_file in converter_files:
+
+def patch_converter(converter_file):
+    """
+    Patch one converter file.
+    Returns (patched, error_message)
+    """
     try:
         # Read the file
         content = converter_file.read_text()
+        if 'pyrit.' not in content:
+            return False, None
         original_content = content
 
         # Apply replacements
         for pattern, replacement in replacements:
-            content = re.sub(pattern, replacement, content)
+            content = pattern.sub(replacement, content)
 
         # Check if anything changed
         if content != original_content:
@@ -61,13 +71,55 @@ for converter_file in converter_files:
 
             # Write patched version
             converter_file.write_text(content)
-
-            patched_count += 1
-            print(f"  ✅ Patched: {converter_file.name}")
+            return True, None
 
     except Exception as e:
+        return False, str(e)
+
+    return False, None
+
+
+def stat_key(path):
+    """Cache key for a file: mtime_ns and size."""
+    st = path.stat()
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+# Skip files untouched since the last run
+cache_file = Path(".patch_cache.json")
+try:
+    cache = json.loads(cache_file.read_text() or '{}')
+except (OSError, ValueError):
+    cache = {}
+
+pending_files = [f for f in converter_files if cache.get(str(f)) != stat_key(f)]
+skipped_count = len(converter_files) - len(pending_files)
+if skipped_count:
+    print(f"Skipping {skipped_count} unchanged files")
+
+patched_count = 0
+error_count = 0
+
+# Files are independent, so patch them concurrently
+with ThreadPoolExecutor() as executor:
+    results = list(executor.map(patch_converter, pending_files))
+
+report = []
+for converter_file, (patched, error) in zip(pending_files, results):
+    if error is not None:
         error_count += 1
-        print(f"  ❌ Error patching {converter_file.name}: {e}")
+        report.append(f"  ❌ Error patching {converter_file.name}: {error}")
+        continue
+    if patched:
+        patched_count += 1
+        report.append(f"  ✅ Patched: {converter_file.name}")
+    cache[str(converter_file)] = stat_key(converter_file)
+
+# One write for the whole per-file report
+if report:
+    sys.stdout.write('\n'.join(report) + '\n')
+
+cache_file.write_text(json.dumps(cache, indent=2))
 
 print(f"\n" + "="*80)
 print("PATCHING COMPLETE")
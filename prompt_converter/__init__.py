@@ -3,6 +3,11 @@ Prompt Converter Package
 Local collection of prompt converters
 """
 
+import functools
+import importlib
+import re
+from pathlib import Path
+
 # Make pyrit_compat available globally by adding to sys.modules
 import sys
 from . import pyrit_compat
@@ -10,4 +15,26 @@ from . import pyrit_compat
 # This allows converters to do: from pyrit_compat import ...
 sys.modules['pyrit_compat'] = pyrit_compat
 
-__version__ = "1.0.0"
\ No newline at end of file
+__version__ = "1.0.0"
+
+_CLASS_DEF_RE = re.compile(r"^class (\w+Converter)\b", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=None)
+def _converter_index():
+    """Map converter class names to their module by scanning source (no imports)."""
+    index = {}
+    for path in sorted(Path(__file__).parent.glob("*_converter.py")):
+        source = path.read_text(encoding="utf-8", errors="ignore")
+        for class_name in _CLASS_DEF_RE.findall(source):
+            index.setdefault(class_name, path.stem)
+    return index
+
+
+def __getattr__(name):
+    """Import converter classes on first access, e.g. prompt_converter.Base64Converter."""
+    module_name = _converter_index().get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    return getattr(module, name)
@@ -4,11 +4,16 @@ Provides dummy implementations of PyRIT classes that may be missing or incompati
 This allows converters built for different PyRIT versions to run locally.
 """
 
-from typing import Optional, Any, Dict, Literal, TypeVar, Generic
+from typing import Optional, Any, Dict, Literal
 from pathlib import Path
-import uuid
+import functools
+import inspect
+import os
 
-T = TypeVar('T')
+
+def _new_id() -> str:
+    """Generate a unique 32-char hex id (128 random bits, like uuid4)."""
+    return os.urandom(16).hex()
 
 
 # ============================================================================
@@ -21,8 +26,10 @@ try:
 except ImportError:
     class ConverterIdentifier:
         """Dummy ConverterIdentifier for converters."""
+        __slots__ = ('id', 'type_name')
+        
         def __init__(self, **kwargs):
-            self.id = str(uuid.uuid4())
+            self.id = _new_id()
             self.type_name = kwargs.get('type_name', 'unknown')
 
 
@@ -53,14 +60,17 @@ try:
 except ImportError:
     class SeedPrompt:
         """Dummy SeedPrompt for template-based converters."""
+        __slots__ = ('name', 'data', 'template')
+        
         def __init__(self, name: str = "", data: str = ""):
             self.name = name
             self.data = data
             self.template = data
         
         @classmethod
+        @functools.lru_cache(maxsize=None)
         def from_yaml_file(cls, path):
-            """Load seed prompt from YAML file."""
+            """Load seed prompt from YAML file (cached per path)."""
             return cls(name=Path(path).stem)
         
         def render_template_value(self, **kwargs):
@@ -69,10 +79,13 @@ except ImportError:
 
 
 # Identifiable - Base class for identifiable objects
-class Identifiable(Generic[T]):
-    """Generic identifiable base class that can hold any identifier type."""
+class Identifiable:
+    """Identifiable base class that can hold any identifier type."""
+    # Identifiable[SomeIdentifier] is accepted and returns the class itself
+    __class_getitem__ = classmethod(lambda cls, item: cls)
+    
     def __init__(self):
-        self.id = str(uuid.uuid4())
+        self.id = _new_id()
 
 
 # ============================================================================
@@ -81,6 +94,8 @@ class Identifiable(Generic[T]):
 
 class ConverterResult:
     """Result of a converter operation."""
+    __slots__ = ('output_text', 'output_type')
+    
     def __init__(self, output_text: str, output_type: str = "text"):
         self.output_text = output_text
         self.output_type = output_type
@@ -93,9 +108,11 @@ class PromptDataType:
     audio = "audio"
     video = "video"
     
+    _VALID = frozenset((text, image, audio, video))
+    
     @staticmethod
     def is_valid(data_type):
-        return data_type in ("text", "image", "audio", "video")
+        return data_type in PromptDataType._VALID
 
 
 class PromptConverter:
@@ -104,6 +121,8 @@ class PromptConverter:
     All converters should inherit from this.
     """
     
+    __slots__ = ('params',)
+    
     SUPPORTED_INPUT_TYPES: tuple = ("text",)
     SUPPORTED_OUTPUT_TYPES: tuple = ("text",)
     
@@ -144,6 +163,8 @@ class PromptConverter:
 
 class WordLevelConverter(PromptConverter):
     """Base class for word-level text converters."""
+    # No __slots__: combined with LLMGenericTextConverter via multiple
+    # inheritance, so only one of them could add slots without a layout clash
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -173,6 +194,8 @@ class PromptChatTarget:
 
 class LLMResponse:
     """Response from an LLM."""
+    __slots__ = ('content',)
+    
     def __init__(self, content: str):
         self.content = content
 
@@ -207,13 +230,30 @@ def data_serializer_factory(data_type: str):
     return DummySerializer()
 
 
-def apply_defaults(**kwargs):
-    """Decorator to apply default values to function arguments."""
+def apply_defaults(func=None, /, **defaults):
+    """
+    Decorator to apply default values to function arguments.
+    Usable bare (@apply_defaults) or with defaults (@apply_defaults(x=1)).
+    Sync functions (e.g. converter __init__) get a sync wrapper.
+    """
     def decorator(func):
-        async def wrapper(*args, **call_kwargs):
-            merged = {**kwargs, **call_kwargs}
-            return await func(*args, **merged)
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **call_kwargs):
+                for key, value in defaults.items():
+                    call_kwargs.setdefault(key, value)
+                return await func(*args, **call_kwargs)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **call_kwargs):
+            for key, value in defaults.items():
+                call_kwargs.setdefault(key, value)
+            return func(*args, **call_kwargs)
         return wrapper
+    
+    if func is not None:
+        return decorator(func)
     return decorator
 
 
@@ -22,6 +22,8 @@ class TenseConverter(LLMGenericTextConverter):
     An existing ``PromptChatTarget`` is used to perform the conversion (like Azure OpenAI).
     """
 
+    _DEFAULT_TEMPLATE_PATH = pathlib.Path(CONVERTER_SEED_PROMPT_PATH) / "tense_converter.yaml"
+
     @apply_defaults
     def __init__(
         self,
@@ -43,7 +45,7 @@ class TenseConverter(LLMGenericTextConverter):
         prompt_template = (
             prompt_template
             if prompt_template
-            else SeedPrompt.from_yaml_file(pathlib.Path(CONVERTER_SEED_PROMPT_PATH) / "tense_converter.yaml")
+            else SeedPrompt.from_yaml_file(self._DEFAULT_TEMPLATE_PATH)
         )
 
         super().__init__(
@@ -4,27 +4,53 @@ Excel Prompt Converter Processor - VERBOSE VERSION
 Shows detailed failure reasons for debugging
 """
 
+from __future__ import annotations
+
 import asyncio
+import functools
+import hashlib
+import json
 import logging
+import os
 import sys
 import importlib
 import importlib.util
 import inspect
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-import pandas as pd
-from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple
+
+# pandas is imported where it is used, so --help and startup do not pay for it
+if TYPE_CHECKING:
+    import pandas as pd
+
+# asyncio.timeout is 3.11+; async_timeout provides the same context manager before
+# that, and without either the self-test falls back to asyncio.wait_for
+try:
+    from asyncio import timeout as async_timeout
+except ImportError:
+    try:
+        from async_timeout import timeout as async_timeout
+    except ImportError:
+        async_timeout = None
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-# Pre-import pyrit_compat to make it available to all converter modules
-# This is done by adding it to sys.modules so converters can do: from pyrit_compat import ...
-converter_dir = Path(__file__).parent / "prompt_converter"
-pyrit_compat_path = converter_dir / "pyrit_compat.py"
-spec = importlib.util.spec_from_file_location("pyrit_compat", pyrit_compat_path)
-pyrit_compat = importlib.util.module_from_spec(spec)
-sys.modules['pyrit_compat'] = pyrit_compat
-spec.loader.exec_module(pyrit_compat)
+
+def _ensure_pyrit_compat():
+    """Pre-import pyrit_compat to make it available to all converter modules.
+
+    This is done by adding it to sys.modules so converters can do: from pyrit_compat import ...
+    Deferred until discovery so runs that never load converters skip it.
+    """
+    if 'pyrit_compat' in sys.modules:
+        return
+    converter_dir = Path(__file__).parent / "prompt_converter"
+    pyrit_compat_path = converter_dir / "pyrit_compat.py"
+    spec = importlib.util.spec_from_file_location("pyrit_compat", pyrit_compat_path)
+    pyrit_compat = importlib.util.module_from_spec(spec)
+    sys.modules['pyrit_compat'] = pyrit_compat
+    spec.loader.exec_module(pyrit_compat)
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,17 +58,211 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Upper bound on in-flight convert_async calls, so converters backed by
+# remote endpoints are not flooded
+MAX_CONCURRENT_CONVERSIONS = 32
+
+# Discovery results are cached here, keyed by a fingerprint of the converter directory
+DISCOVERY_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'prompt_converter_discovery'
+
+# Excel worksheet limits (rows include the header)
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_COLUMNS = 16_384
+
+# Failures re-tested even on a cached run, since installing a dependency can fix them
+RETESTED_FAILURES = ('Import failed', 'Instantiation failed', 'Could not instantiate')
+
+# Rows processed concurrently by process_excel; a slow row only holds up its
+# own worker instead of the whole sheet
+ROW_WORKERS = 8
+
+
+def _scan_converter_dir(converter_dir: Path) -> Tuple[List[str], str]:
+    """List converter module names and fingerprint the directory in one scandir pass.
+
+    The fingerprint covers name, mtime and size of every *_converter.py plus the
+    package __init__.py and pyrit_compat.py, so any edit invalidates cached discovery.
+    """
+    module_names = []
+    stamps = [str(converter_dir.resolve())]
+    with os.scandir(converter_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            is_converter = name.endswith('_converter.py')
+            if (is_converter or name in ('__init__.py', 'pyrit_compat.py')) and entry.is_file():
+                st = entry.stat()
+                stamps.append(f"{name}:{st.st_mtime_ns}:{st.st_size}")
+                if is_converter:
+                    module_names.append(name[:-len('.py')])
+
+    fingerprint = hashlib.sha1('\n'.join(sorted(stamps)).encode()).hexdigest()
+    return sorted(module_names), fingerprint
+
+
+@functools.lru_cache(maxsize=None)
+def _find_converter_spec(module_name: str):
+    """Locate a local converter module without executing it (None if missing)."""
+    return importlib.util.find_spec(f'prompt_converter.{module_name}')
+
+
+@functools.lru_cache(maxsize=None)
+def _load_converter_classes(module_name: str) -> Tuple[Tuple[str, Any], ...]:
+    """Import a local converter module and return its (name, class) converter pairs."""
+    full_name = f'prompt_converter.{module_name}'
+    module = sys.modules.get(full_name) or importlib.import_module(full_name)
+
+    # Only classes defined in this module: imported bases (PromptConverter,
+    # LLMGenericTextConverter, ...) would otherwise be re-tested in every module
+    return tuple(sorted(
+        (name, obj) for name, obj in vars(module).items()
+        if name.endswith('Converter') and name[0] != '_'
+        and isinstance(obj, type) and obj.__module__ == module.__name__
+    ))
+
+
+@functools.lru_cache(maxsize=None)
+def _init_parameters(converter_class: Any) -> Tuple[frozenset, frozenset, bool]:
+    """Constructor keywords of a converter class: (accepted, required, takes **kwargs)."""
+    try:
+        parameters = inspect.signature(converter_class).parameters.values()
+    except (TypeError, ValueError):
+        # No introspectable signature: accept anything and let the call decide
+        return frozenset(), frozenset(), True
+
+    keyword_kinds = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    accepted = frozenset(p.name for p in parameters if p.kind in keyword_kinds)
+    required = frozenset(
+        p.name for p in parameters
+        if p.kind in keyword_kinds and p.default is inspect.Parameter.empty
+    )
+    has_var_kw = any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters)
+    return accepted, required, has_var_kw
+
+
+def read_table(input_file: str) -> pd.DataFrame:
+    """Read an Excel or CSV input file."""
+    import pandas as pd
+
+    if input_file.lower().endswith('.csv'):
+        return pd.read_csv(input_file)
+
+    try:
+        # Rust-based reader (python-calamine, pandas >= 2.2); much faster than openpyxl
+        return pd.read_excel(input_file, engine='calamine')
+    except ImportError as e:
+        logger.debug(f"calamine reader unavailable ({e}); using the default Excel reader")
+    except Exception as e:
+        # Unknown engine on older pandas, or a file calamine cannot parse (e.g. CSV
+        # text without a .csv extension raises CalamineError)
+        logger.debug(f"calamine could not read {input_file} ({type(e).__name__}: {e}); "
+                     f"using the default Excel reader")
+
+    try:
+        return pd.read_excel(input_file)
+    except Exception as e:
+        logger.warning(f"Could not read {input_file} as Excel ({type(e).__name__}: {e}); trying CSV")
+        return pd.read_csv(input_file)
+
+
+def write_excel(df: pd.DataFrame, output_file: str) -> None:
+    """Write df to Excel, streaming .xlsx rows with xlsxwriter when it is installed.
+
+    pandas emits cells column by column, which xlsxwriter's constant_memory mode
+    silently drops, so rows are written here directly in order.
+    """
+    import pandas as pd
+
+    if not output_file.lower().endswith('.xlsx') or importlib.util.find_spec('xlsxwriter') is None:
+        df.to_excel(output_file, index=False)
+        return
+
+    import contextlib
+    import datetime
+    import xlsxwriter
+
+    # xlsxwriter does not raise on these; it returns an error code and drops or
+    # truncates the cell
+    if len(df) + 1 > EXCEL_MAX_ROWS or len(df.columns) > EXCEL_MAX_COLUMNS:
+        raise ValueError(
+            f"This sheet is too large! Your sheet size is: {len(df) + 1}, {len(df.columns)} "
+            f"Max sheet size is: {EXCEL_MAX_ROWS}, {EXCEL_MAX_COLUMNS}"
+        )
+
+    workbook = xlsxwriter.Workbook(output_file, {
+        'constant_memory': True,
+        # Keep cell text verbatim, as the openpyxl writer does
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+        # Dates formatted as df.to_excel does; tz-aware values keep their wall-clock
+        # time and +-inf becomes an error cell instead of raising
+        'default_date_format': 'YYYY-MM-DD HH:MM:SS',
+        'remove_timezone': True,
+        'nan_inf_to_errors': True,
+    })
+    try:
+        worksheet = workbook.add_worksheet()
+        date_format = workbook.add_format({'num_format': 'YYYY-MM-DD'})
+        worksheet.write_row(0, 0, [str(column) for column in df.columns])
+        for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+            for col_idx, value in enumerate(row):
+                if pd.api.types.is_scalar(value) and pd.isna(value):
+                    continue
+                if type(value) is datetime.date:
+                    status = worksheet.write_datetime(row_idx, col_idx, value, date_format)
+                else:
+                    status = worksheet.write(row_idx, col_idx, value)
+                if status:
+                    # -2: string over Excel's 32,767 character cell limit, truncated
+                    raise ValueError(
+                        f"Could not write cell ({row_idx}, {df.columns[col_idx]!r}): "
+                        f"xlsxwriter returned {status}"
+                    )
+        workbook.close()
+    except Exception:
+        # Don't leave a partial workbook behind next to write_table's CSV fallback
+        with contextlib.suppress(Exception):
+            workbook.close()
+        Path(output_file).unlink(missing_ok=True)
+        raise
+
+
+def write_table(df: pd.DataFrame, output_file: str) -> str:
+    """Write df in the format given by output_file's extension; returns the path written.
+
+    .parquet and .csv are written directly. Anything else goes to Excel, falling
+    back to a .csv alongside if the Excel write fails.
+    """
+    lower_name = output_file.lower()
+    try:
+        if lower_name.endswith('.parquet'):
+            df.to_parquet(output_file, index=False)
+        elif lower_name.endswith('.csv'):
+            df.to_csv(output_file, index=False)
+        else:
+            write_excel(df, output_file)
+        return output_file
+    except Exception as e:
+        csv_file = str(Path(output_file).with_suffix('.csv'))
+        logger.warning(f"Could not write {output_file} ({type(e).__name__}: {e}); saving as {csv_file}")
+        df.to_csv(csv_file, index=False)
+        return csv_file
+
+
 class ConverterDiscovery:
     """Discovers and tests all available prompt converters from local directory."""
 
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, use_cache: bool = True):
         self.working_converters: Dict[str, Any] = {}
         self.failed_converters: Dict[str, str] = {}
         self.text_to_text_converters: Dict[str, Any] = {}
         self.verbose = verbose
+        self.use_cache = use_cache
+        # class name -> module it was found in, for caching failures per module
+        self._converter_modules: Dict[str, str] = {}
 
     async def discover_and_test_converters(self):
         """Discover all converters from local prompt_converter directory."""
+        _ensure_pyrit_compat()
         logger.info("🔍 Starting converter discovery from local directory...")
 
         converter_dir = Path(__file__).parent / "prompt_converter"
@@ -52,12 +272,33 @@ class ConverterDiscovery:
 
         logger.info(f"📁 Found converter directory: {converter_dir}")
 
-        converter_files = list(converter_dir.glob("*_converter.py"))
-        logger.info(f"📦 Found {len(converter_files)} converter files")
+        module_names, fingerprint = _scan_converter_dir(converter_dir)
+        logger.info(f"📦 Found {len(module_names)} converter files")
 
-        for converter_file in sorted(converter_files):
-            module_name = converter_file.stem
-            await self._test_converter_module(module_name)
+        cache_file = DISCOVERY_CACHE_DIR / f"{fingerprint}.json"
+        cached = self._load_discovery_cache(cache_file) if self.use_cache else None
+
+        if cached is not None and await self._restore_from_cache(cached):
+            logger.info(f"♻️  Reused cached discovery results: {cache_file}")
+        else:
+            self.working_converters.clear()
+            self.failed_converters.clear()
+            self.text_to_text_converters.clear()
+
+            # Modules are imported and tested concurrently
+            await asyncio.gather(*(
+                self._test_converter_module(module_name)
+                for module_name in module_names
+            ))
+
+        # Also re-saved after a cache hit, since re-tested failures may now work
+        if self.use_cache:
+            self._save_discovery_cache(cache_file)
+
+        # Completion order varies between runs; keep converters (and so the
+        # output columns) in name order
+        self.working_converters = dict(sorted(self.working_converters.items()))
+        self.text_to_text_converters = dict(sorted(self.text_to_text_converters.items()))
 
         logger.info(f"\n✅ Working converters: {len(self.working_converters)}")
         logger.info(f"❌ Failed converters: {len(self.failed_converters)}")
@@ -72,15 +313,116 @@ class ConverterDiscovery:
                 print(f"\n❌ {name}:")
                 print(f"   {error}")
 
+    def _load_discovery_cache(self, cache_file: Path) -> Optional[Dict[str, Any]]:
+        """Load cached discovery results, or None if there are no usable ones for this fingerprint."""
+        try:
+            cached = json.loads(cache_file.read_text())
+        except (OSError, ValueError):
+            return None
+
+        # Written by another version, or edited by hand: ignore it and rediscover
+        if not isinstance(cached, dict) or cached.keys() != {'working', 'failed', 'retest'}:
+            return None
+        for section in cached.values():
+            if not isinstance(section, dict) or not all(
+                isinstance(key, str) and isinstance(value, str) for key, value in section.items()
+            ):
+                return None
+        return cached
+
+    def _save_discovery_cache(self, cache_file: Path):
+        """Record which converters worked (and their modules) and why the rest failed."""
+        cached = {
+            'working': {
+                class_name: type(info['instance']).__module__.rsplit('.', 1)[-1]
+                for class_name, info in self.working_converters.items()
+            },
+            'failed': self.failed_converters,
+            # Failures a newly installed dependency can fix, re-tested on every
+            # cached run: name -> module (module-level failures map to themselves)
+            'retest': {
+                name: self._converter_modules.get(name, name)
+                for name, error in self.failed_converters.items()
+                if error.startswith(RETESTED_FAILURES)
+            },
+        }
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(cached, indent=2))
+        except OSError as e:
+            logger.debug(f"Could not write discovery cache {cache_file}: {e}")
+
+    async def _restore_from_cache(self, cached: Dict[str, Any]) -> bool:
+        """Re-instantiate converters recorded as working, without re-running their self-tests.
+
+        Import and instantiation failures are tested again; other failures are
+        reused as recorded. Returns False if any working converter can no longer
+        be loaded, so the caller falls back to full discovery.
+        """
+        for class_name, module_name in cached['working'].items():
+            try:
+                converter_classes = dict(await asyncio.to_thread(_load_converter_classes, module_name))
+                converter_instance = await self._try_instantiate(converter_classes[class_name], class_name)
+            except Exception:
+                converter_instance = None
+
+            if converter_instance is None:
+                return False
+
+            self._record_working(class_name, converter_instance)
+            self._converter_modules[class_name] = module_name
+
+        retest = cached['retest']
+        self.failed_converters.update(
+            (name, error) for name, error in cached['failed'].items() if name not in retest
+        )
+        await asyncio.gather(*(
+            self._retest_failed(name, module_name) for name, module_name in retest.items()
+        ))
+        return True
+
+    async def _retest_failed(self, name: str, module_name: str):
+        """Test a cached failure again: a whole module, or one class within its module."""
+        if name == module_name:
+            await self._test_converter_module(module_name)
+            return
+
+        try:
+            converter_classes = dict(await asyncio.to_thread(_load_converter_classes, module_name))
+        except Exception as e:
+            self.failed_converters[module_name] = f"Import failed: {type(e).__name__}: {str(e)}"
+            return
+
+        if name in converter_classes:
+            self._converter_modules[name] = module_name
+            await self._test_converter_class(name, converter_classes[name])
+
+    def _record_working(self, class_name: str, converter_instance: Any) -> bool:
+        """Register a working converter; returns whether it is text-to-text."""
+        supported_inputs = getattr(converter_instance, 'SUPPORTED_INPUT_TYPES', ())
+        supported_outputs = getattr(converter_instance, 'SUPPORTED_OUTPUT_TYPES', ())
+
+        is_text_to_text = 'text' in supported_inputs and 'text' in supported_outputs
+
+        self.working_converters[class_name] = {
+            'instance': converter_instance,
+            'inputs': supported_inputs,
+            'outputs': supported_outputs,
+            'is_text_to_text': is_text_to_text
+        }
+        if is_text_to_text:
+            self.text_to_text_converters[class_name] = converter_instance
+        return is_text_to_text
+
     async def _test_converter_module(self, module_name: str):
         """Test a converter module from local directory."""
         try:
-            module = importlib.import_module(f'prompt_converter.{module_name}')
+            if _find_converter_spec(module_name) is None:
+                self.failed_converters[module_name] = "Import failed: module spec not found"
+                return
 
-            converter_classes = [
-                (name, obj) for name, obj in inspect.getmembers(module, inspect.isclass)
-                if name.endswith('Converter') and not name.startswith('_')
-            ]
+            # Importing runs module-level code synchronously, so keep it off the event loop
+            converter_classes = await asyncio.to_thread(_load_converter_classes, module_name)
 
             if not converter_classes:
                 if self.verbose:
@@ -88,6 +430,7 @@ class ConverterDiscovery:
                 return
 
             for class_name, converter_class in converter_classes:
+                self._converter_modules[class_name] = module_name
                 await self._test_converter_class(class_name, converter_class)
 
         except Exception as e:
@@ -100,51 +443,39 @@ class ConverterDiscovery:
         """Test if a converter class can be instantiated and used."""
         try:
             # Try to instantiate with various parameter combinations
-            converter_instance = await self._try_instantiate(converter_class, class_name)
+            try:
+                converter_instance = await self._try_instantiate(converter_class, class_name)
+            except Exception as e:
+                self.failed_converters[class_name] = f"Instantiation failed: {type(e).__name__}: {str(e)}"
+                return
 
             if converter_instance is None:
                 self.failed_converters[class_name] = "Could not instantiate with any known parameters"
                 return
 
-            supported_inputs = getattr(converter_instance, 'SUPPORTED_INPUT_TYPES', ())
-            supported_outputs = getattr(converter_instance, 'SUPPORTED_OUTPUT_TYPES', ())
-
-            is_text_to_text = 'text' in supported_inputs and 'text' in supported_outputs
-
             # Test conversion (with timeout to avoid hanging on interactive converters)
             try:
                 # Skip HumanInTheLoopConverter testing as it requires user interaction
                 if class_name == "HumanInTheLoopConverter":
                     # Just mark it as working without testing
-                    self.working_converters[class_name] = {
-                        'instance': converter_instance,
-                        'inputs': supported_inputs,
-                        'outputs': supported_outputs,
-                        'is_text_to_text': is_text_to_text
-                    }
-                    if is_text_to_text:
-                        self.text_to_text_converters[class_name] = converter_instance
+                    if self._record_working(class_name, converter_instance):
                         logger.info(f"  ✅ {class_name} - Text→Text (skipped test)")
                 else:
-                    test_result = await asyncio.wait_for(
-                        converter_instance.convert_async(
-                            prompt="test",
-                            input_type="text"
-                        ),
-                        timeout=5.0  # 5 second timeout
+                    test_conversion = converter_instance.convert_async(
+                        prompt="test",
+                        input_type="text"
                     )
+                    if async_timeout is None:
+                        test_result = await asyncio.wait_for(test_conversion, timeout=5.0)
+                    else:
+                        async with async_timeout(5.0):  # 5 second timeout
+                            test_result = await test_conversion
 
-                    self.working_converters[class_name] = {
-                        'instance': converter_instance,
-                        'inputs': supported_inputs,
-                        'outputs': supported_outputs,
-                        'is_text_to_text': is_text_to_text
-                    }
-
-                    if is_text_to_text:
-                        self.text_to_text_converters[class_name] = converter_instance
+                    if self._record_working(class_name, converter_instance):
                         logger.info(f"  ✅ {class_name} - Text→Text")
                     else:
+                        supported_inputs = self.working_converters[class_name]['inputs']
+                        supported_outputs = self.working_converters[class_name]['outputs']
                         input_type = supported_inputs[0] if supported_inputs else 'unknown'
                         output_type = supported_outputs[0] if supported_outputs else 'unknown'
                         logger.info(f"  ⚠️  {class_name} - {input_type}→{output_type}")
@@ -191,6 +522,13 @@ class ConverterDiscovery:
             {'prompt_target': None},
         ]
 
+        # Only try patterns the constructor signature can accept
+        accepted, required, has_var_kw = _init_parameters(converter_class)
+        patterns = [
+            params for params in patterns
+            if required.issubset(params) and (has_var_kw or accepted.issuperset(params))
+        ]
+
         # Try each pattern
         for params in patterns:
             try:
@@ -198,27 +536,12 @@ class ConverterDiscovery:
                 if self.verbose:
                     logger.debug(f"    ✅ {class_name} instantiated with: {params}")
                 return instance
-            except TypeError as e:
-                # Wrong parameters, continue
+            except (TypeError, ValueError) as e:
+                # Wrong parameters or rejected values, try the next pattern.
+                # Anything else is a real error and propagates to the caller.
+                if self.verbose:
+                    logger.debug(f"    ⚠️  {class_name} rejected {params}: {type(e).__name__}: {e}")
                 continue
-            except ValueError as e:
-                # Invalid parameter value
-                error_str = str(e).lower()
-                if 'required' in error_str or 'empty' in error_str or 'valid' in error_str:
-                    # These are parameter validation errors, continue
-                    continue
-                else:
-                    # Real error, stop
-                    if self.verbose:
-                        logger.debug(f"    ❌ {class_name} ValueError: {e}")
-                    break
-            except Exception as e:
-                # Other error, stop trying
-                error_str = str(e).lower()
-                if "required" not in error_str and "missing" not in error_str:
-                    if self.verbose:
-                        logger.debug(f"    ❌ {class_name} {type(e).__name__}: {e}")
-                    break
 
         return None
 
@@ -229,24 +552,57 @@ class ExcelPromptProcessor:
     def __init__(self, discovery: ConverterDiscovery):
         self.discovery = discovery
 
+    def _bound_converters(self) -> List[Tuple[str, Any]]:
+        """(name, convert_async) for each text-to-text converter, resolved once per run."""
+        return [
+            (converter_name, converter.convert_async)
+            for converter_name, converter in self.discovery.text_to_text_converters.items()
+        ]
+
+    async def _convert_all(
+        self,
+        prompt: str,
+        convert_fns: List[Any],
+        semaphore: asyncio.Semaphore
+    ) -> List[Any]:
+        """Run every converter's convert_async on a prompt concurrently.
+
+        Returns one entry per converter, in converter order: the ConverterResult,
+        or the exception the converter raised.
+        """
+        async def convert(convert_async):
+            async with semaphore:
+                return await convert_async(prompt=prompt, input_type="text")
+
+        return await asyncio.gather(
+            *(convert(convert_async) for convert_async in convert_fns),
+            return_exceptions=True
+        )
+
     async def process_excel(
         self,
         input_file: str,
         output_file: Optional[str] = None,
         prompt_column: str = 'prompt',
-        max_rows: Optional[int] = None
+        max_rows: Optional[int] = None,
+        dedupe: bool = False
     ):
-        """Process Excel file by running all working converters on each prompt."""
+        """Process Excel file by running all working converters on each prompt.
+
+        With dedupe, converters run once per distinct prompt and duplicate rows
+        share the result. Off by default: many converters are random, and repeated
+        rows are often there to get several different perturbations.
+        """
+        import pandas as pd
+        from datetime import datetime
+
         logger.info(f"\n📊 Processing Excel file: {input_file}")
 
         try:
-            df = pd.read_excel(input_file)
-        except Exception:
-            try:
-                df = pd.read_csv(input_file)
-            except Exception as e:
-                logger.error(f"Failed to read input file: {e}")
-                return
+            df = read_table(input_file)
+        except Exception as e:
+            logger.error(f"Failed to read input file: {e}")
+            return
 
         if prompt_column not in df.columns:
             logger.error(f"Column '{prompt_column}' not found. Available: {list(df.columns)}")
@@ -257,85 +613,158 @@ class ExcelPromptProcessor:
 
         logger.info(f"📝 Processing {len(df)} rows with {len(self.discovery.text_to_text_converters)} converters")
 
-        results = df.copy()
-
-        for idx in range(len(df)):
-            prompt = df.iloc[idx][prompt_column]
-
-            if pd.isna(prompt) or str(prompt).strip() == '':
-                continue
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CONVERSIONS)
+        bound = self._bound_converters()
+        converter_names = [converter_name for converter_name, _ in bound]
+        convert_fns = [convert_async for _, convert_async in bound]
 
-            logger.info(f"\n🔄 Processing row {idx + 1}/{len(df)}: {str(prompt)[:50]}...")
+        # Collected per converter and assigned as whole columns at the end,
+        # instead of one pandas cell write per result
+        outputs: Dict[str, List[Optional[str]]] = {
+            name: [None] * len(df) for name in converter_names
+        }
 
-            for converter_name, converter in self.discovery.text_to_text_converters.items():
+        # Unbounded: every prompt is already in memory, and the producer must never
+        # block on a queue that no worker is draining
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def store(converter_name: str, indices: List[int], value: str):
+            column = outputs[converter_name]
+            for idx in indices:
+                column[idx] = value
+
+        async def process_prompt(prompt: str, indices: List[int]):
+            logger.info(f"\n🔄 Processing row {indices[0] + 1}/{len(df)}: {prompt[:50]}...")
+            if len(indices) > 1:
+                logger.debug(f"  ♻️  Reusing results for {len(indices) - 1} duplicate row(s)")
+
+            outcomes = await self._convert_all(prompt, convert_fns, semaphore)
+
+            for converter_name, outcome in zip(converter_names, outcomes):
+                # gather(return_exceptions=True) also hands back BaseExceptions
+                # such as CancelledError
+                if not isinstance(outcome, BaseException):
+                    try:
+                        value = outcome.output_text
+                        logger.debug(f"  ✅ {converter_name}: {value[:30]}...")
+                    except Exception as e:
+                        outcome = e
+                if isinstance(outcome, BaseException):
+                    error = str(outcome) or type(outcome).__name__
+                    logger.warning(f"  ⚠️  {converter_name} failed: {error}")
+                    value = f"ERROR: {error}"
+                store(converter_name, indices, value)
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                prompt, indices = item
                 try:
-                    result = await converter.convert_async(
-                        prompt=str(prompt),
-                        input_type="text"
-                    )
+                    await process_prompt(prompt, indices)
+                except Exception as e:
+                    # Keep the worker alive so the rest of the sheet still gets processed
+                    logger.error(f"  ❌ Row {indices[0] + 1} failed: {e}")
+                    for converter_name in converter_names:
+                        store(converter_name, indices, f"ERROR: {str(e)}")
 
-                    column_name = f"{converter_name}_output"
-                    results.loc[idx, column_name] = result.output_text
+        workers = [asyncio.create_task(worker()) for _ in range(ROW_WORKERS)]
 
-                    logger.debug(f"  ✅ {converter_name}: {result.output_text[:30]}...")
+        # One vectorized cast; the mask keeps NaN cells (cast to 'nan') skipped
+        present = df[prompt_column].notna().to_numpy()
+        prompts = df[prompt_column].astype(str).tolist()
 
-                except Exception as e:
-                    logger.warning(f"  ⚠️  {converter_name} failed: {e}")
-                    column_name = f"{converter_name}_output"
-                    results.loc[idx, column_name] = f"ERROR: {str(e)}"
+        items: List[Tuple[str, List[int]]] = []
+        rows_by_prompt: Dict[str, List[int]] = {}
+        for idx, prompt in enumerate(prompts):
+            if not present[idx] or prompt.strip() == '':
+                continue
+
+            if not dedupe:
+                items.append((prompt, [idx]))
+            elif prompt in rows_by_prompt:
+                rows_by_prompt[prompt].append(idx)
+            else:
+                rows_by_prompt[prompt] = [idx]
+                items.append((prompt, rows_by_prompt[prompt]))
+
+        prompt_rows = sum(len(indices) for _, indices in items)
+        if len(items) < prompt_rows:
+            logger.info(f"🔁 {len(items)} unique prompts across {prompt_rows} rows")
+
+        for item in items:
+            queue.put_nowait(item)
+
+        for _ in workers:
+            queue.put_nowait(None)
+        await asyncio.gather(*workers)
+
+        # Output columns already in the input (e.g. re-running on an enriched sheet)
+        # are overwritten in place on the processed rows only; skipped rows keep
+        # their values
+        processed_rows = [idx for _, indices in items for idx in indices]
+        results = df
+        new_columns: Dict[str, List[Optional[str]]] = {}
+        for converter_name, column in outputs.items():
+            column_name = f"{converter_name}_output"
+            if column_name not in df.columns:
+                new_columns[column_name] = column
+                continue
+            if results is df:
+                results = df.copy()
+            existing = results[column_name].astype(object)
+            existing.iloc[processed_rows] = [column[idx] for idx in processed_rows]
+            results[column_name] = existing
+
+        # New columns go on as one object-dtype block, instead of growing the
+        # frame column by column
+        if new_columns:
+            results = pd.concat(
+                [results, pd.DataFrame(new_columns, index=df.index, dtype=object)],
+                axis=1
+            )
 
         if output_file is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = f"enriched_prompts_{timestamp}.xlsx"
 
-        try:
-            results.to_excel(output_file, index=False)
-            logger.info(f"\n💾 Saved enriched data to: {output_file}")
-            logger.info(f"📈 Original columns: {len(df.columns)} → New columns: {len(results.columns)}")
-        except Exception as e:
-            csv_file = output_file.replace('.xlsx', '.csv')
-            results.to_csv(csv_file, index=False)
-            logger.info(f"\n💾 Saved enriched data to CSV: {csv_file}")
+        saved_file = write_table(results, output_file)
+        logger.info(f"\n💾 Saved enriched data to: {saved_file}")
+        logger.info(f"📈 Original columns: {len(df.columns)} → New columns: {len(results.columns)}")
 
     async def process_single_prompt(self, prompt: str) -> pd.DataFrame:
         """Process a single prompt with all working converters."""
-        logger.info(f"\n🎯 Processing prompt: {prompt}")
+        import pandas as pd
 
-        results = {
-            'Converter': [],
-            'Input': [],
-            'Output': [],
-            'Status': []
-        }
-
-        for converter_name, converter in self.discovery.text_to_text_converters.items():
-            try:
-                result = await converter.convert_async(
-                    prompt=prompt,
-                    input_type="text"
-                )
-
-                results['Converter'].append(converter_name)
-                results['Input'].append(prompt)
-                results['Output'].append(result.output_text)
-                results['Status'].append('✅ Success')
-
-                logger.info(f"  ✅ {converter_name}")
+        logger.info(f"\n🎯 Processing prompt: {prompt}")
 
-            except Exception as e:
-                results['Converter'].append(converter_name)
-                results['Input'].append(prompt)
-                results['Output'].append(str(e))
-                results['Status'].append(f'❌ {type(e).__name__}')
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CONVERSIONS)
+        bound = self._bound_converters()
+        outcomes = await self._convert_all(
+            prompt, [convert_async for _, convert_async in bound], semaphore
+        )
 
-                logger.warning(f"  ❌ {converter_name}: {e}")
+        # Outcomes come back in converter order regardless of completion order
+        rows = []
+        for (converter_name, _), outcome in zip(bound, outcomes):
+            if not isinstance(outcome, BaseException):
+                try:
+                    rows.append((converter_name, prompt, outcome.output_text, '✅ Success'))
+                    logger.info(f"  ✅ {converter_name}")
+                    continue
+                except Exception as e:
+                    outcome = e
+            logger.warning(f"  ❌ {converter_name}: {outcome}")
+            rows.append((converter_name, prompt, str(outcome), f'❌ {type(outcome).__name__}'))
 
-        return pd.DataFrame(results)
+        return pd.DataFrame(rows, columns=['Converter', 'Input', 'Output', 'Status'])
 
 
 async def main():
     """Main entry point."""
     import argparse
+    from datetime import datetime
 
     parser = argparse.ArgumentParser(
         description='Excel Prompt Converter Processor',
@@ -348,13 +777,15 @@ async def main():
     parser.add_argument('-c', '--prompt-column', default='prompt', help='Prompt column name')
     parser.add_argument('-m', '--max-rows', type=int, help='Max rows to process')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output (show why converters fail)')
+    parser.add_argument('--dedupe', action='store_true', help='Convert each distinct prompt once and reuse the result for duplicate rows')
+    parser.add_argument('--no-cache', action='store_true', help='Re-run converter discovery instead of reusing cached results')
 
     args = parser.parse_args()
 
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    discovery = ConverterDiscovery(verbose=args.verbose)
+    discovery = ConverterDiscovery(verbose=args.verbose, use_cache=not args.no_cache)
     await discovery.discover_and_test_converters()
 
     if len(discovery.text_to_text_converters) == 0:
@@ -368,11 +799,7 @@ async def main():
     if args.prompt:
         results_df = await processor.process_single_prompt(args.prompt)
         output_file = args.output or f"prompt_variations_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        try:
-            results_df.to_excel(output_file, index=False)
-        except:
-            output_file = output_file.replace('.xlsx', '.csv')
-            results_df.to_csv(output_file, index=False)
+        output_file = write_table(results_df, output_file)
 
         print("\n" + "="*80)
         print("RESULTS SUMMARY")
@@ -385,7 +812,8 @@ async def main():
             input_file=args.input_file,
             output_file=args.output,
             prompt_column=args.prompt_column,
-            max_rows=args.max_rows
+            max_rows=args.max_rows,
+            dedupe=args.dedupe
         )
     else:
         parser.print_help()
@@ -404,5 +832,18 @@ async def main():
             print(f"  • {name}")
 
 
+def run(coro):
+    """Run coro to completion, on a uvloop event loop when uvloop is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    uvloop.install()
+    return asyncio.run(coro)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())